@@ -1,21 +1,82 @@
 # Enhanced EDM Generator with Professional Festival-Ready Features
 # Adds pitch bends, filter automation, better synths, and modern production techniques
 
+import json
+import os
 import sys
+import wave as wav_io
 import yaml
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Union, Tuple, cast
-from scipy.io import wavfile
-from scipy.signal import butter, lfilter, savgol_filter
-from scipy.ndimage import gaussian_filter1d
+from scipy.signal import butter, lfilter, sosfilt
+
+# Numba is optional: when it is missing the jitted kernels below fall back to
+# plain Python, which is slow but produces identical output.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+# libyaml-backed YAML classes when PyYAML was built with them; the C
+# parser/emitter is roughly an order of magnitude faster than the
+# pure-Python ones and parsing is the first thing every render does.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # Note to frequency conversion
 NOTES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
+# Precomputed name -> frequency table: note_to_freq is hit once per note per
+# render, so the common spellings collapse to a single dict lookup.
+NOTE_FREQ = {
+    f"{name}{octave}": 440 * (2 ** ((octave - 4) + (i - 9) / 12))
+    for octave in range(0, 10)
+    for i, name in enumerate(NOTES)
+}
+# Flat aliases (resolved one semitone down in the same octave, matching the
+# parser) and bare names defaulting to octave 4, so those spellings also hit
+# the fast path.
+for _octave in range(0, 10):
+    for _letter in "CDEFGAB":
+        _semi = (NOTES.index(_letter) - 1) % 12
+        NOTE_FREQ[f"{_letter}b{_octave}"] = 440 * (
+            2 ** ((_octave - 4) + (_semi - 9) / 12)
+        )
+for _name in NOTES:
+    NOTE_FREQ[_name] = NOTE_FREQ[f"{_name}4"]
+for _letter in "CDEFGAB":
+    NOTE_FREQ[f"{_letter}b"] = NOTE_FREQ[f"{_letter}b4"]
+del _octave, _letter, _semi, _name
+
+# Every spelling in the table plus the silence markers, for O(1)
+# membership tests in the validator.
+_VALID_NOTES = frozenset(NOTE_FREQ) | {"rest", ""}
+
 
 def note_to_freq(note):
     if note == "rest" or note == "":
         return 0
+    freq = NOTE_FREQ.get(note)
+    if freq is not None:
+        return freq
+    return _parse_note_freq(note)
+
+
+@lru_cache(maxsize=256)
+def _parse_note_freq(note):
+    """Slow-path parser for spellings not in NOTE_FREQ (flats, bare names,
+    lowercase). Raises ValueError for invalid names, which the YAML
+    validator relies on; lru_cache never caches a raising call, so that
+    contract survives memoization. Songs reuse a handful of spellings,
+    so each distinct valid one is parsed once per process."""
     octave = int(note[-1]) if note[-1].isdigit() else 4
     note_name = note[:-1] if note[-1].isdigit() else note
 
@@ -32,47 +93,213 @@ def note_to_freq(note):
     return 440 * (2 ** ((octave - 4) + (semitones - 9) / 12))
 
 
-# Enhanced ADSR envelope with curve control
-def apply_envelope(
-    wave, duration, fs, attack=0.01, decay=0.1, sustain=0.5, release=0.1, curve=1.0
-):
-    n_samples = len(wave)
-    if n_samples == 0:
-        return wave
+_RNG = np.random.default_rng()
 
-    t = np.linspace(0, duration, n_samples)
-    envelope = np.ones(n_samples)
-    attack_samples = min(int(attack * fs), n_samples)
-    decay_samples = min(int(decay * fs), n_samples - attack_samples)
-    release_samples = min(int(release * fs), n_samples)
+
+def _noise(n):
+    """Uniform float32 noise in [-1, 1) straight from the PCG64 generator,
+    which is several times faster than the legacy global Mersenne Twister
+    and skips the float64 round trip."""
+    return _RNG.random(n, dtype=np.float32) * np.float32(2.0) - np.float32(1.0)
+
+
+_T_CACHE = {}
+
+
+def _time_vector(n, fs):
+    """Shared time grid t = arange(n)/fs.
+
+    Note and hit durations are quantized to beat fractions, so the same
+    lengths recur constantly; the cache makes the grid allocation free and
+    float32 halves the bandwidth of every oscillator pass consuming it.
+    The cached array is read-only.
+    """
+    key = (n, fs)
+    t = _T_CACHE.get(key)
+    if t is None:
+        t = np.arange(n, dtype=np.float32) / np.float32(fs)
+        t.flags.writeable = False
+        _T_CACHE[key] = t
+    return t
+
+
+@lru_cache(maxsize=256)
+def _unit_ramp(n, curve):
+    """Shared 0..1 ramp of n samples raised to curve.
+
+    Envelopes of different total lengths still use the same attack and
+    release segment lengths, so the ramps dedupe across envelope shapes."""
+    ramp = np.linspace(0, 1, n, dtype=np.float32) ** curve
+    ramp.flags.writeable = False
+    return ramp
+
+
+# Enhanced ADSR envelope with curve control
+@lru_cache(maxsize=256)
+def _make_envelope(n_samples, attack_samples, decay_samples, release_samples,
+                   sustain, curve):
+    """Build one ADSR envelope array.
+
+    Drum hits and notes reuse a handful of (length, ADSR) shapes thousands
+    of times per song, so the cache turns envelope construction into a dict
+    hit. The returned array is shared and therefore read-only.
+    """
+    envelope = np.ones(n_samples, dtype=np.float32)
     sustain_level = sustain
 
     if attack_samples > 0:
-        attack_curve = np.linspace(0, 1, attack_samples) ** curve
-        envelope[:attack_samples] = attack_curve
+        envelope[:attack_samples] = _unit_ramp(attack_samples, curve)
 
     if decay_samples > 0:
         start_decay = attack_samples
         end_decay = min(start_decay + decay_samples, n_samples - release_samples)
         actual_decay_samples = end_decay - start_decay
         if actual_decay_samples > 0:
-            decay_curve = 1 - (np.linspace(0, 1, actual_decay_samples) ** curve) * (
-                1 - sustain_level
-            )
-            envelope[start_decay:end_decay] = decay_curve
+            envelope[start_decay:end_decay] = 1 - _unit_ramp(
+                actual_decay_samples, curve
+            ) * (1 - sustain_level)
 
     start_release = max(0, n_samples - release_samples)
     if release_samples > 0 and start_release < n_samples:
         actual_release_samples = n_samples - start_release
-        release_curve = sustain_level * (
-            1 - np.linspace(0, 1, actual_release_samples) ** curve
+        envelope[start_release:] = sustain_level * (
+            1 - _unit_ramp(actual_release_samples, curve)
         )
-        envelope[start_release:] = release_curve
 
-    return wave * envelope
+    envelope.flags.writeable = False
+    return envelope
+
+
+def apply_envelope(
+    wave, duration, fs, attack=0.01, decay=0.1, sustain=0.5, release=0.1,
+    curve=1.0, out=None
+):
+    """Shape wave with an ADSR envelope; pass out=wave to multiply in
+    place and skip the output allocation."""
+    n_samples = len(wave)
+    if n_samples == 0:
+        return wave
+
+    attack_samples = min(int(attack * fs), n_samples)
+    envelope = _make_envelope(
+        n_samples,
+        attack_samples,
+        min(int(decay * fs), n_samples - attack_samples),
+        min(int(release * fs), n_samples),
+        sustain,
+        curve,
+    )
+    if out is None:
+        return wave * envelope
+    np.multiply(wave, envelope, out=out)
+    return out
 
 
 # Filter functions
+@lru_cache(maxsize=4096)
+def _design_butter(order, low, high, btype):
+    if high is None:
+        return butter(order, low / 10000.0, btype=btype)
+    return butter(order, [low / 10000.0, high / 10000.0], btype=btype)
+
+
+@lru_cache(maxsize=4096)
+def _design_butter_sos(order, low, high, btype):
+    if high is None:
+        return butter(order, low / 10000.0, btype=btype, output="sos")
+    return butter(order, [low / 10000.0, high / 10000.0], btype=btype, output="sos")
+
+
+def _butter_sos_cached(order, normalized_cutoff, btype):
+    """Memoized butter() in second-order-section form for filters above
+    order two; sosfilt runs the whole cascade in one C call."""
+    if np.isscalar(normalized_cutoff):
+        return _design_butter_sos(order, round(normalized_cutoff * 10000), None, btype)
+    low, high = normalized_cutoff
+    return _design_butter_sos(order, round(low * 10000), round(high * 10000), btype)
+
+
+def _butter_cached(order, normalized_cutoff, btype):
+    """Memoized butter(): identical filters get redesigned for every note,
+    so cache the coefficients on the cutoff quantized to 1e-4."""
+    if np.isscalar(normalized_cutoff):
+        return _design_butter(order, round(normalized_cutoff * 10000), None, btype)
+    low, high = normalized_cutoff
+    return _design_butter(order, round(low * 10000), round(high * 10000), btype)
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _biquad(b0, b1, b2, a1, a2, x, y):
+    """Second-order IIR in direct form II transposed.
+
+    scipy.signal.lfilter pays setup overhead on every call, which dominates
+    for note-length buffers; a jitted biquad avoids that entirely.
+    """
+    z1 = 0.0
+    z2 = 0.0
+    for n in range(x.shape[0]):
+        xn = x[n]
+        yn = b0 * xn + z1
+        z1 = b1 * xn - a1 * yn + z2
+        z2 = b2 * xn - a2 * yn
+        y[n] = yn
+
+
+def _biquad_filter(b, a, wave):
+    """Run a second-order (b, a) filter through the jitted biquad kernel."""
+    if len(b) != 3 or len(a) != 3:
+        return cast(np.ndarray, lfilter(b, a, wave))
+    inv_a0 = 1.0 / a[0]
+    out = np.empty_like(wave)
+    _biquad(
+        b[0] * inv_a0,
+        b[1] * inv_a0,
+        b[2] * inv_a0,
+        a[1] * inv_a0,
+        a[2] * inv_a0,
+        wave,
+        out,
+    )
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _tv_lowpass(x, cutoff, fs, block=32):
+    """Time-varying lowpass: RBJ-cookbook biquad whose coefficients are
+    recomputed once per block from the cutoff sweep. Coefficient design is
+    n/block transcendental evaluations; the per-sample work is the same FMA
+    chain as the fixed biquad."""
+    n = x.shape[0]
+    y = np.empty_like(x)
+    z1 = 0.0
+    z2 = 0.0
+    i = 0
+    while i < n:
+        end = min(i + block, n)
+        fc = cutoff[i]
+        if fc < 10.0:
+            fc = 10.0
+        hi = 0.49 * fs
+        if fc > hi:
+            fc = hi
+        w0 = 2.0 * np.pi * fc / fs
+        cw = np.cos(w0)
+        alpha = np.sin(w0) * 0.7071067811865476  # Q = 1/sqrt(2)
+        inv_a0 = 1.0 / (1.0 + alpha)
+        b1 = (1.0 - cw) * inv_a0
+        b0 = b1 * 0.5
+        a1 = -2.0 * cw * inv_a0
+        a2 = (1.0 - alpha) * inv_a0
+        for j in range(i, end):
+            xn = x[j]
+            yn = b0 * xn + z1
+            z1 = b1 * xn - a1 * yn + z2
+            z2 = b0 * xn - a2 * yn
+            y[j] = yn
+        i = end
+    return y
+
+
 def apply_lowpass(
     wave: np.ndarray,
     cutoff: Union[float, np.ndarray],
@@ -87,47 +314,34 @@ def apply_lowpass(
             float(cutoff) if not isinstance(cutoff, (str, bytes, complex)) else 0.0
         )
         normalized_cutoff = min(cutoff_val / nyquist, 0.99)
-        coeffs = butter(2, normalized_cutoff, btype="low")
+        coeffs = _butter_cached(2, normalized_cutoff, "low")
         if coeffs is not None:
             b, a = coeffs[0], coeffs[1]
         else:
             b = a = np.array([1.0])
-        filtered = lfilter(b, a, wave)
+        filtered = _biquad_filter(b, a, wave)
         # Add resonance by mixing with bandpass
         if resonance > 1:
-            bp_coeffs = butter(
+            bp_sos = _butter_sos_cached(
                 2,
-                [normalized_cutoff * 0.9, min(normalized_cutoff * 1.1, 0.99)],
-                btype="band",
+                (normalized_cutoff * 0.9, min(normalized_cutoff * 1.1, 0.99)),
+                "band",
+            )
+            resonant = cast(np.ndarray, sosfilt(bp_sos, wave)).astype(
+                wave.dtype, copy=False
             )
-            if bp_coeffs is not None:
-                bp_b, bp_a = bp_coeffs[0], bp_coeffs[1]
-            else:
-                bp_b = bp_a = np.array([1.0])
-            resonant = cast(np.ndarray, lfilter(bp_b, bp_a, wave))
             filtered = filtered + resonant * (resonance - 1) * 0.3
     else:
-        # For time-varying cutoff, use the median cutoff value as a compromise
-        # This is a simplified approach that avoids sample-by-sample processing
-        median_cutoff = np.median(cutoff)
-        normalized_cutoff = min(float(median_cutoff) / nyquist, 0.99)
-        coeffs = butter(2, normalized_cutoff, btype="low")
-        if coeffs is not None:
-            b, a = coeffs[0], coeffs[1]
-        else:
-            b = a = np.array([1.0])
-        filtered = lfilter(b, a, wave)
-
-        # Apply amplitude envelope based on cutoff sweep
-        if isinstance(cutoff, np.ndarray):
-            envelope = np.interp(
+        # Time-varying cutoff: run a real block-coefficient sweep instead of
+        # the old median-cutoff-plus-amplitude-envelope approximation.
+        cutoff_arr = np.asarray(cutoff, dtype=np.float64)
+        if len(cutoff_arr) != len(wave):
+            cutoff_arr = np.interp(
                 np.arange(len(wave)),
-                np.linspace(0, len(wave) - 1, len(cutoff)),
-                cutoff / np.max(cutoff),
+                np.linspace(0, len(wave) - 1, len(cutoff_arr)),
+                cutoff_arr,
             )
-        else:
-            envelope = np.ones(len(wave))
-        filtered = filtered * envelope
+        filtered = _tv_lowpass(wave, cutoff_arr, float(fs))
 
     return cast(np.ndarray, filtered)
 
@@ -135,20 +349,107 @@ def apply_lowpass(
 def apply_highpass(wave: np.ndarray, cutoff: float, fs: float) -> np.ndarray:
     nyquist = fs / 2
     normalized_cutoff = min(cutoff / nyquist, 0.99)
-    coeffs = butter(2, normalized_cutoff, btype="high")
+    coeffs = _butter_cached(2, normalized_cutoff, "high")
     if coeffs is not None:
         b, a = coeffs[0], coeffs[1]
     else:
         b = a = np.array([1.0])
-    return cast(np.ndarray, lfilter(b, a, wave))
+    return _biquad_filter(b, a, wave)
+
+
+# Band-limited sawtooth built from its Fourier partials. Unlike the
+# floor()-based naive saw this does not alias, and the cost scales with the
+# harmonic count rather than a fixed number of full-buffer passes.
+def bl_saw(phase, n_harmonics=16):
+    out = np.zeros_like(phase)
+    for k in range(1, n_harmonics + 1):
+        out += np.sin(k * phase) / k
+    return out * (2 / np.pi)
+
+
+def _saw_harmonics(freq, fs, limit=16):
+    """Harmonic count for bl_saw, capped at the Nyquist frequency."""
+    return max(1, min(limit, int(fs / (2 * freq))))
+
+
+def _cw(freq, n, fs):
+    """Complex exponential exp(2j*pi*freq*t) built by repeated doubling.
+
+    Each doubling multiplies the samples so far by a single rotation, so
+    only O(log n) transcendental evaluations are needed. The imaginary part
+    is the sine, the real part the cosine, and harmonics come free as
+    elementwise powers (z*z is the second harmonic).
+    """
+    out = np.empty(n, dtype=np.complex64)
+    if n == 0:
+        return out
+    out[0] = 1.0
+    rot = np.complex64(np.exp(2j * np.pi * freq / fs))
+    span = 1
+    while span < n:
+        m = min(span, n - span)
+        out[span : span + m] = out[:m] * rot
+        span += m
+        rot = rot * rot
+    return out
+
+
+def _sine(freq, n, fs):
+    """Sine oscillator equivalent to np.sin(2*np.pi*freq*t)."""
+    return _cw(freq, n, fs).imag
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _nco_sine(freq_curve, fs, block=32):
+    """Sine chirp from a frequency curve via a recursive sin/cos rotator.
+
+    The complex rotator is re-primed from the curve once per block, so the
+    inner loop is four multiply-adds per sample with no transcendentals and
+    no intermediate cumsum/phase buffers.
+    """
+    n = freq_curve.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    k = 2.0 * np.pi / fs
+    c = 1.0
+    s = 0.0
+    i = 0
+    while i < n:
+        end = min(i + block, n)
+        d = freq_curve[i] * k
+        cd = np.cos(d)
+        sd = np.sin(d)
+        for j in range(i, end):
+            cn = c * cd - s * sd
+            s = s * cd + c * sd
+            c = cn
+            out[j] = s
+        i = end
+    return out
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _nco_phase(freq_curve, fs):
+    """Running phase of a frequency curve, accumulated in float64.
+
+    Single fused pass replacing cumsum followed by a scale, with better
+    precision than a float32 cumsum over long notes.
+    """
+    n = freq_curve.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    k = 2.0 * np.pi / fs
+    acc = 0.0
+    for i in range(n):
+        acc += freq_curve[i] * k
+        out[i] = acc
+    return out
 
 
 # Enhanced instrument generators
 def generate_kick(duration, fs, punch=1.0):
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
     # Enhanced kick with sub harmonics
     freq = 60 + 200 * punch * np.exp(-t / 0.05)
-    wave = np.sin(2 * np.pi * np.cumsum(freq) / fs)
+    wave = _nco_sine(freq, float(fs))
     # Add click for punch
     click = np.sin(2 * np.pi * 150 * t) * np.exp(-t / 0.002)
     wave = wave + click * 0.3
@@ -156,54 +457,63 @@ def generate_kick(duration, fs, punch=1.0):
     sub = np.sin(2 * np.pi * 50 * t) * np.exp(-t / 0.15)
     wave = wave * 0.7 + sub * 0.3
     wave = apply_envelope(
-        wave, duration, fs, attack=0.002, decay=0.2, sustain=0.1, release=0.1, curve=2
+        wave, duration, fs, attack=0.002, decay=0.2, sustain=0.1, release=0.1, curve=2, out=wave
     )
-    return np.tanh(wave * 1.2) * 0.9  # Soft saturation
+    # Soft saturation, fused in place on the envelope output
+    wave *= 1.2
+    np.tanh(wave, out=wave)
+    wave *= 0.9
+    return wave
 
 
 def generate_hihat(duration, fs, tone=0.5):
     samples = int(fs * duration)
     # Mix noise with metallic tone
-    wave = np.random.uniform(-1, 1, samples)
+    wave = _noise(samples)
     # Add metallic resonance
-    t = np.linspace(0, duration, samples)
+    t = _time_vector(samples, fs)
     metallic = np.sin(2 * np.pi * 8000 * t) * tone
     wave = wave * (1 - tone) + metallic
     wave = apply_highpass(wave, 4000, fs)
     wave = apply_envelope(
-        wave, duration, fs, attack=0.002, decay=0.03, sustain=0.0, release=0.02
+        wave, duration, fs, attack=0.002, decay=0.03, sustain=0.0, release=0.02, out=wave
     )
     return wave * 0.3
 
 
 def generate_snare(duration, fs, tone=0.5):
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
     # Enhanced snare with multiple tones
     tone1 = np.sin(2 * np.pi * 200 * t)
     tone2 = np.sin(2 * np.pi * 300 * t)
     tones = (tone1 + tone2 * 0.7) * tone
-    noise = np.random.uniform(-1, 1, int(fs * duration))
+    noise = _noise(int(fs * duration))
     noise_filtered = apply_highpass(noise, 200, fs)
     wave = tones * 0.4 + noise_filtered * 0.6
     wave = apply_envelope(
-        wave, duration, fs, attack=0.002, decay=0.03, sustain=0.0, release=0.05
+        wave, duration, fs, attack=0.002, decay=0.03, sustain=0.0, release=0.05, out=wave
     )
-    return np.tanh(wave) * 0.6
+    np.tanh(wave, out=wave)
+    wave *= 0.6
+    return wave
 
 
 def generate_clap(duration, fs):
-    wave = np.zeros(int(fs * duration))
+    samples = int(fs * duration)
+    wave = np.zeros(samples, dtype=np.float32)
     num_claps = 4
-    clap_spacing = 0.008
-    for i in range(num_claps):
-        start = int(i * clap_spacing * fs)
-        clap_len = min(int(0.008 * fs), len(wave) - start)
-        if clap_len > 0:
-            clap_hit = np.random.uniform(-1, 1, clap_len)
-            wave[start : start + clap_len] = clap_hit * (0.7 + i * 0.1)
+    seg = int(0.008 * fs)
+    total = min(num_claps * seg, samples)
+    # The bursts sit back to back, so one noise draw covers all of them and
+    # the rising per-clap level becomes a repeated gain vector.
+    gains = np.repeat(
+        np.float32(0.7) + np.float32(0.1) * np.arange(num_claps, dtype=np.float32),
+        seg,
+    )[:total]
+    wave[:total] = _noise(total) * gains
     wave = apply_highpass(wave, 1000, fs)
     wave = apply_envelope(
-        wave, duration, fs, attack=0.001, decay=0.02, sustain=0.0, release=0.04
+        wave, duration, fs, attack=0.001, decay=0.02, sustain=0.0, release=0.04, out=wave
     )
     return wave * 0.5
 
@@ -211,21 +521,19 @@ def generate_clap(duration, fs):
 def generate_supersaw(freq, duration, fs, detune=0.03, voices=7):
     """Generate supersaw lead sound (signature of progressive house)"""
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    t = np.linspace(0, duration, int(fs * duration))
-    wave = np.zeros(len(t))
+    t = _time_vector(int(fs * duration), fs)
 
-    for i in range(voices):
-        detune_factor = 1 + (i - voices // 2) * detune / voices
-        # Saw wave
-        voice = 2 * (
-            freq * detune_factor * t - np.floor(0.5 + freq * detune_factor * t)
-        )
-        # Add slight phase randomization
-        phase_shift = np.random.random() * 2 * np.pi
-        voice = np.roll(voice, int(phase_shift * fs / (2 * np.pi * freq)))
-        wave += voice / voices
+    # All voices in one broadcasted (voices, n) saw computation, with the
+    # per-voice phase randomization folded into the fractional part instead
+    # of the np.roll the per-voice loop used
+    detune_factors = (
+        1 + (np.arange(voices) - voices // 2) * detune / voices
+    ).astype(np.float32)
+    ft = detune_factors[:, None] * freq * t[None, :]
+    ft += _RNG.random((voices, 1), dtype=np.float32)
+    wave = (2 * (ft - np.floor(0.5 + ft))).mean(axis=0)
 
     # Add subtle pulse width modulation
     lfo = np.sin(2 * np.pi * 3 * t) * 0.02
@@ -236,7 +544,7 @@ def generate_supersaw(freq, duration, fs, detune=0.03, voices=7):
         wave, 4000 + 2000 * np.sin(2 * np.pi * 0.5 * t), fs, resonance=1.5
     )
     wave = apply_envelope(
-        wave, duration, fs, attack=0.02, decay=0.1, sustain=0.7, release=0.2
+        wave, duration, fs, attack=0.02, decay=0.1, sustain=0.7, release=0.2, out=wave
     )
     return wave * 0.4
 
@@ -244,14 +552,16 @@ def generate_supersaw(freq, duration, fs, detune=0.03, voices=7):
 def generate_future_bass(freq, duration, fs):
     """Generate future bass sound with characteristic wobble"""
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
 
     # Multiple detuned saw oscillators
-    wave1 = 2 * (freq * t - np.floor(0.5 + freq * t))
-    wave2 = 2 * (freq * 1.01 * t - np.floor(0.5 + freq * 1.01 * t))
-    wave3 = np.sin(2 * np.pi * freq * 0.5 * t)  # Sub octave
+    phase = 2 * np.pi * freq * t
+    harmonics = _saw_harmonics(freq * 1.01, fs)
+    wave1 = bl_saw(phase, harmonics)
+    wave2 = bl_saw(1.01 * phase, harmonics)
+    wave3 = np.sin(0.5 * phase)  # Sub octave
 
     wave = (wave1 + wave2 * 0.8) * 0.4 + wave3 * 0.3
 
@@ -261,7 +571,7 @@ def generate_future_bass(freq, duration, fs):
     wave = apply_lowpass(wave, filter_env, fs, resonance=2)
 
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.6, release=0.1
+        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.6, release=0.1, out=wave
     )
     return wave * 0.5
 
@@ -269,25 +579,27 @@ def generate_future_bass(freq, duration, fs):
 def generate_reese_bass(freq, duration, fs):
     """Generate Reese bass with characteristic phasing"""
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
 
     # Two slightly detuned saw waves
-    wave1 = 2 * (freq * t - np.floor(0.5 + freq * t))
-    wave2 = 2 * (freq * 1.007 * t - np.floor(0.5 + freq * 1.007 * t))
+    phase = 2 * np.pi * freq * t
+    harmonics = _saw_harmonics(freq * 1.007, fs)
+    wave1 = bl_saw(phase, harmonics)
+    wave2 = bl_saw(1.007 * phase, harmonics)
 
     # Mix creates phasing effect
     wave = (wave1 + wave2) * 0.5
 
     # Add sub sine for weight
-    sub = np.sin(2 * np.pi * freq * 0.5 * t) * 0.3
+    sub = np.sin(0.5 * phase) * 0.3
     wave = wave * 0.7 + sub
 
     # Low pass for warmth
     wave = apply_lowpass(wave, 400, fs, resonance=1.2)
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.1, sustain=0.8, release=0.1
+        wave, duration, fs, attack=0.01, decay=0.1, sustain=0.8, release=0.1, out=wave
     )
     return wave * 0.7
 
@@ -295,13 +607,14 @@ def generate_reese_bass(freq, duration, fs):
 def generate_pluck_bass(freq, duration, fs):
     """Generate plucky bass sound common in progressive house"""
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
 
     # Start with saw and square mix
-    saw = 2 * (freq * t - np.floor(0.5 + freq * t))
-    square = np.sign(np.sin(2 * np.pi * freq * t))
+    phase = 2 * np.pi * freq * t
+    saw = bl_saw(phase, _saw_harmonics(freq, fs))
+    square = np.sign(np.sin(phase))
     wave = saw * 0.6 + square * 0.4
 
     # Add sub
@@ -310,7 +623,7 @@ def generate_pluck_bass(freq, duration, fs):
 
     # Plucky envelope with fast decay
     wave = apply_envelope(
-        wave, duration, fs, attack=0.001, decay=0.15, sustain=0.2, release=0.1
+        wave, duration, fs, attack=0.001, decay=0.15, sustain=0.2, release=0.1, out=wave
     )
 
     # Filter sweep down
@@ -323,37 +636,40 @@ def generate_pluck_bass(freq, duration, fs):
 def generate_dubstep_bass(freq, duration, fs, wobble_rate=2):
     """Generate dubstep wobble bass"""
     if freq == 0:
-        return np.zeros(int(fs * duration))
-
-    t = np.linspace(0, duration, int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    # Heavy sub sine
-    wave = np.sin(2 * np.pi * freq * t)
+    t = _time_vector(int(fs * duration), fs)
 
-    # Add harmonics for grit
-    wave += np.sin(2 * np.pi * freq * 2 * t) * 0.3
-    wave += np.sin(2 * np.pi * freq * 3 * t) * 0.15
+    # Heavy sub sine plus harmonics for grit, as powers of one oscillator
+    z = _cw(freq, len(t), fs)
+    z2 = z * z
+    wave = z.imag + z2.imag * 0.3 + (z2 * z).imag * 0.15
 
-    # LFO for wobble
-    lfo = (1 + np.sin(2 * np.pi * wobble_rate * t)) * 0.5
+    # LFO for wobble, scaled in place and reused for cutoff and volume
+    lfo = np.sin(2 * np.pi * wobble_rate * t)
+    lfo += 1
+    lfo *= 0.5
 
     # Apply filter wobble
-    cutoff = 100 + 500 * lfo
+    cutoff = lfo * 500
+    cutoff += 100
     wave = apply_lowpass(wave, cutoff, fs, resonance=2)
 
-    # Volume wobble
-    wave = wave * (0.3 + 0.7 * lfo)
+    # Volume wobble: rescale the LFO buffer itself instead of allocating
+    lfo *= 0.7
+    lfo += 0.3
+    wave *= lfo
 
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.9, release=0.05
+        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.9, release=0.05, out=wave
     )
     return wave * 0.8
 
 
 def generate_white_noise_riser(duration, fs):
     """Generate white noise riser for transitions"""
-    t = np.linspace(0, duration, int(fs * duration))
-    wave = np.random.uniform(-1, 1, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
+    wave = _noise(int(fs * duration))
 
     # Filter sweep up
     cutoff_env = 200 + 8000 * (t / duration) ** 2
@@ -368,16 +684,16 @@ def generate_white_noise_riser(duration, fs):
 
 def generate_impact(duration, fs):
     """Generate impact/crash sound for drop emphasis"""
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
 
     # Mix of low boom and white noise
     boom = np.sin(2 * np.pi * 40 * t) * np.exp(-t / 0.3)
-    crash = np.random.uniform(-1, 1, int(fs * duration))
+    crash = _noise(int(fs * duration))
     crash_filtered = apply_highpass(crash, 2000, fs)
 
     wave = boom * 0.6 + crash_filtered * 0.4
     wave = apply_envelope(
-        wave, duration, fs, attack=0.001, decay=0.5, sustain=0.3, release=0.5
+        wave, duration, fs, attack=0.001, decay=0.5, sustain=0.3, release=0.5, out=wave
     )
 
     return wave * 0.7
@@ -389,9 +705,9 @@ def generate_pitch_bend_bass(start_note, end_note, duration, fs, bass_type="pluc
     end_freq = note_to_freq(end_note)
 
     if start_freq == 0 and end_freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
 
     # Create pitch bend curve (exponential for musical pitch bend)
     if start_freq > 0 and end_freq > 0:
@@ -402,31 +718,67 @@ def generate_pitch_bend_bass(start_note, end_note, duration, fs, bass_type="pluc
         freq_curve = end_freq * np.ones_like(t)
 
     # Generate the appropriate bass type with pitch bend
-    phase = 2 * np.pi * np.cumsum(freq_curve) / fs
-
     if bass_type == "pluck":
-        wave = np.sin(phase) * 0.5 + 0.5 * np.sign(np.sin(phase))
+        s = _nco_sine(freq_curve, float(fs))
+        wave = s * 0.5 + 0.5 * np.sign(s)
         wave = apply_envelope(
-            wave, duration, fs, attack=0.001, decay=0.15, sustain=0.2, release=0.1
+            wave, duration, fs, attack=0.001, decay=0.15, sustain=0.2, release=0.1, out=wave
         )
     elif bass_type == "reese":
-        wave1 = 2 * (phase / (2 * np.pi) - np.floor(0.5 + phase / (2 * np.pi)))
-        phase2 = 2 * np.pi * np.cumsum(freq_curve * 1.007) / fs
-        wave2 = 2 * (phase2 / (2 * np.pi) - np.floor(0.5 + phase2 / (2 * np.pi)))
+        harmonics = _saw_harmonics(float(np.max(freq_curve)) * 1.007, fs)
+        wave1 = bl_saw(_nco_phase(freq_curve, float(fs)), harmonics)
+        wave2 = bl_saw(_nco_phase(freq_curve * 1.007, float(fs)), harmonics)
         wave = (wave1 + wave2) * 0.5
         wave = apply_lowpass(wave, 400, fs)
         wave = apply_envelope(
-            wave, duration, fs, attack=0.01, decay=0.1, sustain=0.8, release=0.1
+            wave, duration, fs, attack=0.01, decay=0.1, sustain=0.8, release=0.1, out=wave
         )
     else:
-        wave = np.sin(phase)
+        wave = _nco_sine(freq_curve, float(fs))
         wave = apply_envelope(
-            wave, duration, fs, attack=0.01, decay=0.1, sustain=0.7, release=0.1
+            wave, duration, fs, attack=0.01, decay=0.1, sustain=0.7, release=0.1, out=wave
         )
 
     return wave * 0.7
 
 
+@njit(cache=True, nogil=True)
+def _stamp_dips(envelope, dip, starts):
+    """Stamp the canonical sidechain dip at each kick offset, keeping the
+    minimum where dips overlap."""
+    n = envelope.shape[0]
+    m = dip.shape[0]
+    for s in starts:
+        end = min(s + m, n)
+        for i in range(s, end):
+            d = dip[i - s]
+            if d < envelope[i]:
+                envelope[i] = d
+
+
+@njit(cache=True, nogil=True, fastmath=True)
+def _biexp_smooth(x, alpha):
+    """Forward-backward first-order exponential smoother.
+
+    Two O(n) recursive passes (one multiply-add each way) stand in for the
+    Gaussian-equivalent blur on the sidechain envelope; the backward pass
+    cancels the forward pass's phase lag.
+    """
+    n = x.shape[0]
+    y = np.empty_like(x)
+    if n == 0:
+        return y
+    acc = x[0]
+    for i in range(n):
+        acc = alpha * x[i] + (1.0 - alpha) * acc
+        y[i] = acc
+    acc = y[n - 1]
+    for i in range(n - 1, -1, -1):
+        acc = alpha * y[i] + (1.0 - alpha) * acc
+        y[i] = acc
+    return y
+
+
 def apply_sidechain(audio, kick_times, fs, tempo, strength=0.7, style="pump"):
     """Enhanced sidechain with different styles"""
     beat_duration = 60 / tempo
@@ -442,38 +794,32 @@ def apply_sidechain(audio, kick_times, fs, tempo, strength=0.7, style="pump"):
         release_time = beat_duration * 0.15
         strength = strength * 0.5
 
-    envelope = np.ones(len(audio))
-
-    for kick_time in kick_times:
-        attack_start = int(kick_time * fs)
-        attack_samples = int(attack_time * fs)
-        release_samples = int(release_time * fs)
-
-        if attack_start < len(audio):
-            attack_end = min(attack_start + attack_samples, len(audio))
-            if attack_end > attack_start:
-                envelope[attack_start:attack_end] = np.linspace(
-                    envelope[attack_start] if attack_start > 0 else 1,
-                    1 - strength,
-                    attack_end - attack_start,
-                )
-
-            release_start = attack_end
-            release_end = min(release_start + release_samples, len(audio))
-            if release_end > release_start:
-                t = np.linspace(0, 1, release_end - release_start)
-                release_curve = 1 - (1 - (1 - strength)) * np.exp(-5 * t)
-                envelope[release_start:release_end] = release_curve
+    envelope = np.ones(len(audio), dtype=np.float32)
+
+    # Every kick shares the same dip shape, so build it once and stamp it at
+    # each kick offset instead of re-deriving linspace/exp curves per kick.
+    attack_samples = int(attack_time * fs)
+    release_samples = int(release_time * fs)
+    dip = np.concatenate(
+        [
+            np.linspace(1, 1 - strength, attack_samples, dtype=np.float32),
+            1
+            - strength
+            * np.exp(-5 * np.linspace(0, 1, release_samples, dtype=np.float32)),
+        ]
+    ).astype(np.float32)
+    starts = np.array([int(k * fs) for k in kick_times], dtype=np.int64)
+    _stamp_dips(envelope, dip, starts)
 
     # Smooth the envelope
-    envelope = gaussian_filter1d(envelope, sigma=30)
+    envelope = _biexp_smooth(envelope, 1.0 / (30.0 * np.sqrt(2.0 * np.pi)))
 
     return audio * envelope
 
 
 def apply_automation(wave, automation_type, duration, fs, amount=1.0):
     """Apply various automation curves to audio"""
-    t = np.linspace(0, duration, len(wave))
+    t = _time_vector(len(wave), fs)
 
     if automation_type == "fade_in":
         curve = t / duration
@@ -492,124 +838,144 @@ def apply_automation(wave, automation_type, duration, fs, amount=1.0):
 # Keep all original generators for backward compatibility
 def generate_bass(freq, duration, fs):
     if freq == 0:
-        return np.zeros(int(fs * duration))
-    t = np.linspace(0, duration, int(fs * duration))
-    wave = np.sin(2 * np.pi * freq * t)
+        return np.zeros(int(fs * duration), dtype=np.float32)
+    wave = _sine(freq, int(fs * duration), fs)
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.1, sustain=0.6, release=0.1
+        wave, duration, fs, attack=0.01, decay=0.1, sustain=0.6, release=0.1, out=wave
     )
     return wave * 0.7
 
 
 def generate_sub_bass(freq, duration, fs):
     if freq == 0:
-        return np.zeros(int(fs * duration))
-    t = np.linspace(0, duration, int(fs * duration))
-    wave = np.sin(2 * np.pi * freq * t) * 0.8 + np.sin(2 * np.pi * freq * 2 * t) * 0.2
+        return np.zeros(int(fs * duration), dtype=np.float32)
+    z = _cw(freq, int(fs * duration), fs)
+    wave = z.imag * 0.8 + (z * z).imag * 0.2
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.8, release=0.1
+        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.8, release=0.1, out=wave
     )
     return wave * 0.8
 
 
 def generate_melody(freq, duration, fs):
     if freq == 0:
-        return np.zeros(int(fs * duration))
-    t = np.linspace(0, duration, int(fs * duration))
-    wave = 2 * (freq * t - np.floor(0.5 + freq * t))
+        return np.zeros(int(fs * duration), dtype=np.float32)
+    t = _time_vector(int(fs * duration), fs)
+    wave = bl_saw(2 * np.pi * freq * t, _saw_harmonics(freq, fs))
     wave = apply_envelope(
-        wave, duration, fs, attack=0.05, decay=0.2, sustain=0.4, release=0.2
+        wave, duration, fs, attack=0.05, decay=0.2, sustain=0.4, release=0.2, out=wave
     )
     return wave * 0.5
 
 
 def generate_pad(freq, duration, fs):
     if freq == 0:
-        return np.zeros(int(fs * duration))
-    t = np.linspace(0, duration, int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
+    n = int(fs * duration)
+    # The sub, fundamental and octave voices are all powers of one
+    # half-frequency oscillator, so build that once and derive the rest by
+    # elementwise complex squaring; only the detuned voice needs its own.
+    zh = _cw(freq * 0.5, n, fs)
+    z = zh * zh
     wave = (
-        np.sin(2 * np.pi * freq * t)
-        + np.sin(2 * np.pi * freq * 1.01 * t) * 0.7
-        + np.sin(2 * np.pi * freq * 2 * t) * 0.3
-        + np.sin(2 * np.pi * freq * 0.5 * t) * 0.4
+        z.imag
+        + _sine(freq * 1.01, n, fs) * 0.7
+        + (z * z).imag * 0.3
+        + zh.imag * 0.4
     ) / 2.4
     wave = apply_envelope(
-        wave, duration, fs, attack=0.3, decay=0.2, sustain=0.6, release=0.3
+        wave, duration, fs, attack=0.3, decay=0.2, sustain=0.6, release=0.3, out=wave
     )
     return wave * 0.3
 
 
 def generate_sweep(duration, fs, start_freq=100, end_freq=8000, reverse=False):
-    t = np.linspace(0, duration, int(fs * duration))
-    if reverse:
-        freq_sweep = np.linspace(end_freq, start_freq, len(t))
-    else:
-        freq_sweep = np.linspace(start_freq, end_freq, len(t))
-    phase = 2 * np.pi * np.cumsum(freq_sweep) / fs
-    wave = np.sin(phase)
+    t = _time_vector(int(fs * duration), fs)
+    # Linear sweep has a closed-form phase integral, so skip the frequency
+    # array and its serial cumsum entirely.
+    f0 = end_freq if reverse else start_freq
+    f1 = start_freq if reverse else end_freq
+    k = (f1 - f0) / duration
+    wave = np.sin(2 * np.pi * (f0 * t + 0.5 * k * t * t))
     envelope_shape = (
-        np.linspace(0, 1, len(t)) if not reverse else np.linspace(1, 0, len(t))
+        np.linspace(0, 1, len(t), dtype=np.float32)
+        if not reverse
+        else np.linspace(1, 0, len(t), dtype=np.float32)
     )
     wave = wave * envelope_shape
     return wave * 0.3
 
 
+@njit(cache=True, nogil=True, fastmath=True)
+def _ks_core(buffer, output, buffer_size, samples):
+    """Karplus-Strong recurrence: inherently sequential, so run it jitted."""
+    idx = 0
+    for i in range(samples):
+        nxt = idx + 1
+        if nxt == buffer_size:
+            nxt = 0
+        output[i] = buffer[idx]
+        buffer[idx] = 0.996 * 0.5 * (buffer[idx] + buffer[nxt])
+        idx = nxt
+
+
+# Warm-compile the Karplus-Strong kernel at import so the first pluck of a
+# render does not pay JIT latency (cached compiles make this near-free).
+_ks_core(np.zeros(2, dtype=np.float32), np.zeros(1, dtype=np.float32), 2, 1)
+
+
 def generate_pluck(freq, duration, fs):
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
     buffer_size = int(fs / freq)
     samples = int(fs * duration)
-    buffer = np.random.uniform(-1, 1, buffer_size)
-    output = np.zeros(samples)
-
-    for i in range(samples):
-        output[i] = buffer[i % buffer_size]
-        buffer[i % buffer_size] = (
-            0.996 * 0.5 * (buffer[i % buffer_size] + buffer[(i + 1) % buffer_size])
-        )
+    buffer = _noise(buffer_size)
+    output = np.zeros(samples, dtype=np.float32)
+    _ks_core(buffer, output, buffer_size, samples)
 
     envelope = apply_envelope(
-        output, duration, fs, attack=0.001, decay=0.1, sustain=0.3, release=0.2
+        output, duration, fs, attack=0.001, decay=0.1, sustain=0.3, release=0.2, out=output
     )
     return envelope * 0.6
 
 
 def generate_arp(freq, duration, fs, pattern=[1, 1.5, 2, 1.5]):
     if freq == 0:
-        return np.zeros(int(fs * duration))
+        return np.zeros(int(fs * duration), dtype=np.float32)
 
     samples = int(fs * duration)
-    t = np.linspace(0, duration, samples)
-    wave = np.zeros(samples)
-
-    arp_duration = duration / len(pattern)
-    for i, mult in enumerate(pattern):
-        start = int(i * arp_duration * fs)
-        end = min(int((i + 1) * arp_duration * fs), samples)
-        if end > start:
-            t_seg = np.linspace(0, arp_duration, end - start)
-            saw = 2 * (mult * freq * t_seg - np.floor(0.5 + mult * freq * t_seg))
-            square = np.sign(np.sin(2 * np.pi * mult * freq * t_seg))
-            wave[start:end] = 0.6 * saw + 0.4 * square
+    t = _time_vector(samples, fs)
+
+    # One pass over the whole note: a per-sample step index selects the
+    # pattern multiplier, so no Python loop or per-step allocations.
+    step_idx = np.arange(samples) * len(pattern) // samples
+    mult = np.asarray(pattern, dtype=np.float32)[step_idx]
+    cycles = freq * mult * t
+    saw = bl_saw(2 * np.pi * cycles, _saw_harmonics(freq * max(pattern), fs))
+    # Branchless square from the fractional cycle: no sin pass just to take
+    # its sign.
+    frac = cycles - np.floor(cycles)
+    square = np.float32(1.0) - np.float32(2.0) * (frac >= 0.5)
+    wave = 0.6 * saw + 0.4 * square
 
     wave = apply_envelope(
-        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.4, release=0.1
+        wave, duration, fs, attack=0.01, decay=0.05, sustain=0.4, release=0.1, out=wave
     )
     return wave * 0.4
 
 
 def generate_percussion(duration, fs):
-    t = np.linspace(0, duration, int(fs * duration))
+    t = _time_vector(int(fs * duration), fs)
     wave = (
         np.sin(2 * np.pi * 800 * t) * 0.5
         + np.sin(2 * np.pi * 1200 * t) * 0.3
         + np.sin(2 * np.pi * 2000 * t) * 0.2
     )
-    transient = np.random.uniform(-1, 1, min(int(0.002 * fs), len(wave)))
+    transient = _noise(min(int(0.002 * fs), len(wave)))
     wave[: len(transient)] += transient * 0.5
     wave = apply_envelope(
-        wave, duration, fs, attack=0.001, decay=0.02, sustain=0.0, release=0.01
+        wave, duration, fs, attack=0.001, decay=0.02, sustain=0.0, release=0.01, out=wave
     )
     return wave * 0.4
 
@@ -684,10 +1050,11 @@ def validate_yaml_config(data):
                                     f"duration ({total_duration} beats) is much shorter than section ({total_beats} beats)"
                                 )
                     
-                    # Validate note names
-                    valid_notes = ["rest", ""]
+                    # Validate note names: the frozenset covers every
+                    # spelling the table knows, so only unusual ones (e.g.
+                    # lowercase) pay for the parser and its exceptions.
                     for note in notes:
-                        if note in valid_notes:
+                        if note in _VALID_NOTES:
                             continue
                         try:
                             freq = note_to_freq(note)
@@ -762,22 +1129,310 @@ def validate_yaml_config(data):
 
 
 # Main function with enhanced features
+_MELODIC_GENERATORS = {
+    "bass": generate_bass,
+    "sub_bass": generate_sub_bass,
+    "pad": generate_pad,
+    "pluck": generate_pluck,
+    "arp": generate_arp,
+    "future_bass": generate_future_bass,
+    "reese_bass": generate_reese_bass,
+    "pluck_bass": generate_pluck_bass,
+}
+
+
+def _note_renderer(track, track_type, fs):
+    """Resolve the per-note generator once per track.
+
+    Binding the generator and its track parameters up front removes the
+    type dispatch and dict lookups from the per-note loop. Full runtime
+    codegen with baked-in envelope constants would buy little on top: the
+    heavy work already runs inside numpy and the jitted kernels.
+    """
+    if track_type == "supersaw":
+        detune = track.get("detune", 0.03)
+        voices = track.get("voices", 7)
+        return lambda freq, dur: generate_supersaw(freq, dur, fs, detune, voices)
+    if track_type == "dubstep_bass":
+        wobble_rate = track.get("wobble_rate", 2)
+        return lambda freq, dur: generate_dubstep_bass(freq, dur, fs, wobble_rate)
+    gen = _MELODIC_GENERATORS.get(track_type, generate_melody)
+    return lambda freq, dur: gen(freq, dur, fs)
+
+
+def _mix(audio, start, wave):
+    """Accumulate wave into the master buffer at start, in place.
+
+    np.add with out= avoids the temporary that `+=` on a float64 wave would
+    otherwise create for the cast, and the end clamp guards notes that run
+    past the end of the song."""
+    end = min(start + len(wave), len(audio))
+    if end > start:
+        np.add(
+            audio[start:end], wave[: end - start], out=audio[start:end],
+            casting="unsafe",
+        )
+
+
+def _write_wav(path, fs, audio, chunk=1 << 20):
+    """Write mono float audio as 16-bit PCM.
+
+    The int16 conversion happens in ~1M-sample chunks streamed straight to
+    disk, so the integer copy of the whole song never exists in memory.
+    """
+    with wav_io.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(int(fs))
+        for start in range(0, len(audio), chunk):
+            block = (audio[start : start + chunk] * 32767).astype(np.int16)
+            w.writeframes(block.tobytes())
+
+
+def _render_track(
+    track, num_bars, section_start, beat_duration, beat_samples, fs,
+    drum_cache, note_cache
+):
+    """Render one track of one section.
+
+    Returns (events, kicks): events is a list of (start_sample, wave) buffers
+    to mix into the master, kicks the kick hit times. Tracks are independent,
+    so calls run concurrently in a thread pool; numpy ufuncs and the jitted
+    kernels release the GIL on the heavy math. A racing cache fill for the
+    same drum key just wastes one render and is otherwise harmless.
+
+    section_start and beat_samples are integer sample counts: positions are
+    derived by integer arithmetic from a sample cursor, so they cannot drift
+    the way an accumulated float time base can over a long song.
+    """
+    bar_duration = beat_duration * 4
+    section_duration = num_bars * bar_duration
+    events = []
+    kicks = []
+
+    track_type = track["type"]
+    volume = track.get("volume", 1.0)
+
+    # Drum tracks
+    if track_type in ["kick", "hihat", "snare", "clap", "percussion"]:
+        pattern = track["pattern"]
+        pattern_len = len(pattern)
+        hit_index = 0
+        for bar in range(num_bars):
+            for beat in range(4):
+                if isinstance(pattern[beat % pattern_len], (int, float)):
+                    velocity = pattern[beat % pattern_len]
+                else:
+                    velocity = 1 if pattern[beat % pattern_len] else 0
+
+                if velocity > 0:
+                    drum_dur = beat_duration * 0.5
+                    hit_sample = section_start + (bar * 4 + beat) * beat_samples
+
+                    if track_type == "kick":
+                        kicks.append(hit_sample / fs)
+                        punch = track.get("punch", 1.0)
+                        key = (track_type, drum_dur, punch)
+                    elif track_type in ("snare", "hihat"):
+                        tone = track.get("tone", 0.5)
+                        key = (track_type, drum_dur, tone)
+                    else:
+                        key = (track_type, drum_dur)
+
+                    if track_type in ("snare", "hihat", "clap"):
+                        # Noise-based drums: keep a small pool of variants
+                        # and round-robin through them, so caching does not
+                        # make every hit literally identical.
+                        variants = drum_cache.get(key)
+                        if variants is None:
+                            if track_type == "snare":
+                                variants = [
+                                    generate_snare(drum_dur, fs, tone)
+                                    for _ in range(4)
+                                ]
+                            elif track_type == "clap":
+                                variants = [
+                                    generate_clap(drum_dur, fs) for _ in range(4)
+                                ]
+                            else:
+                                variants = [
+                                    generate_hihat(drum_dur, fs, tone)
+                                    for _ in range(4)
+                                ]
+                            drum_cache[key] = variants
+                        wave = variants[hit_index & 3]
+                    else:
+                        wave = drum_cache.get(key)
+                        if wave is None:
+                            if track_type == "kick":
+                                wave = generate_kick(drum_dur, fs, punch)
+                            else:
+                                wave = generate_percussion(drum_dur, fs)
+                            drum_cache[key] = wave
+                    hit_index += 1
+
+                    events.append((hit_sample, wave * (velocity * volume)))
+
+    # Enhanced melodic tracks
+    elif track_type in [
+        "bass",
+        "sub_bass",
+        "melody",
+        "pad",
+        "pluck",
+        "arp",
+        "supersaw",
+        "future_bass",
+        "reese_bass",
+        "pluck_bass",
+        "dubstep_bass",
+        "pitch_bend_bass",
+    ]:
+        notes = track.get("notes", [])
+        durations = track.get("durations", [])
+
+        if track_type == "pitch_bend_bass":
+            # Handle pitch bend bass specially
+            bend_notes = track.get("bend_notes", [])
+            bass_style = track.get("bass_style", "pluck")
+            seq_len = len(notes)
+            pos = 0.0
+            idx = 0
+
+            while pos < section_duration:
+                start_note = notes[idx % seq_len]
+                end_note = (
+                    bend_notes[idx % len(bend_notes)]
+                    if bend_notes
+                    else start_note
+                )
+                dur_beats = durations[idx % len(durations)]
+                note_dur = dur_beats * beat_duration
+
+                if pos + note_dur > section_duration:
+                    note_dur = section_duration - pos
+
+                wave = generate_pitch_bend_bass(
+                    start_note, end_note, note_dur, fs, bass_style
+                )
+                wave *= volume
+                events.append((section_start + int(pos * fs), wave))
+
+                pos += dur_beats * beat_duration
+                idx += 1
+        else:
+            # Regular melodic tracks
+            seq_len = len(notes)
+            render_note = _note_renderer(track, track_type, fs)
+            automation = track.get("automation", None)
+
+            # First pass: flatten the looped sequence into parallel arrays
+            # of (start_sample, freq, duration) note events.
+            note_events = []
+            pos = 0.0
+            idx = 0
+            while pos < section_duration:
+                note = notes[idx % seq_len]
+                dur_beats = durations[idx % len(durations)]
+                note_dur = dur_beats * beat_duration
+
+                if pos + note_dur > section_duration:
+                    note_dur = section_duration - pos
+
+                note_events.append(
+                    (section_start + int(pos * fs), note_to_freq(note), note_dur)
+                )
+                pos += dur_beats * beat_duration
+                idx += 1
+
+            # Second pass: looping sequences repeat the same (freq, duration)
+            # pairs every cycle -- and whole sections repeat tracks -- so
+            # render each distinct note once per song and mix the shared
+            # buffer at every occurrence. The key carries every parameter
+            # that shapes the sound.
+            param_key = (
+                track_type,
+                track.get("detune", 0.03) if track_type == "supersaw" else None,
+                track.get("voices", 7) if track_type == "supersaw" else None,
+                track.get("wobble_rate", 2)
+                if track_type == "dubstep_bass"
+                else None,
+                automation,
+                volume,
+            )
+            for start_sample, freq, note_dur in note_events:
+                cache_key = (param_key, freq, note_dur)
+                wave = note_cache.get(cache_key)
+                if wave is None:
+                    wave = render_note(freq, note_dur)
+                    if automation:
+                        wave = apply_automation(wave, automation, note_dur, fs)
+                    wave = wave * volume
+                    note_cache[cache_key] = wave
+                events.append((start_sample, wave))
+
+    # FX tracks
+    elif track_type == "sweep":
+        sweep_dur = section_duration
+        reverse = track.get("reverse", False)
+        start_freq = track.get("start_freq", 100)
+        end_freq = track.get("end_freq", 8000)
+        wave = generate_sweep(sweep_dur, fs, start_freq, end_freq, reverse)
+        wave *= volume
+        events.append((section_start, wave))
+
+    elif track_type == "white_noise_riser":
+        riser_dur = section_duration
+        wave = generate_white_noise_riser(riser_dur, fs)
+        wave *= volume
+        events.append((section_start, wave))
+
+    elif track_type == "impact":
+        impact_dur = beat_duration * 2
+        wave = generate_impact(impact_dur, fs)
+        wave *= volume
+        events.append((section_start, wave))
+
+    return events, kicks
+
+
 def generate_edm_from_yaml(yaml_file, output_wav):
+    """Load a config file and render it.
+
+    A .json extension selects the stdlib JSON parser, which is C-coded
+    and handles the same plain-dict configs; everything else goes
+    through YAML."""
     with open(yaml_file, "r") as f:
-        data = yaml.safe_load(f)
-    
+        if yaml_file.endswith(".json"):
+            data = json.load(f)
+        else:
+            data = yaml.load(f, Loader=_YAML_LOADER)
+    generate_edm_from_config(data, output_wav)
+
+
+def generate_edm_from_config(data, output_wav=None):
+    """Render a song from an already-parsed config dict.
+
+    Everything below the YAML parse lives here so callers that already
+    hold the config (tests, future JSON/MIDI front ends) can skip the
+    serialization round trip entirely. With output_wav=None the mastered
+    float32 buffer is returned as (fs, audio) instead of being written
+    to disk.
+    """
     # Validate YAML configuration before processing
     errors, warnings = validate_yaml_config(data)
     
-    # Print warnings
-    for warning in warnings:
-        print(f"Warning: {warning}")
+    # Print warnings and errors as one write per block instead of a print
+    # per message; the strings are already built by the validator.
+    if warnings:
+        print("\n".join(f"Warning: {warning}" for warning in warnings))
     
     # Stop if there are errors
     if errors:
-        print(f"\n❌ YAML validation failed with {len(errors)} error(s):")
-        for error in errors:
-            print(f"  • {error}")
+        print(
+            f"\n❌ YAML validation failed with {len(errors)} error(s):\n"
+            + "\n".join(f"  • {error}" for error in errors)
+        )
         sys.exit(1)
     
     print(f"✓ YAML validation passed")
@@ -789,199 +1444,55 @@ def generate_edm_from_yaml(yaml_file, output_wav):
     sidechain_enabled = data.get("sidechain", False)
     sidechain_style = data.get("sidechain_style", "pump")
 
-    # Calculate total duration
-    total_duration = sum(section["bars"] * bar_duration for section in data["sections"])
-    audio = np.zeros(int(total_duration * fs), dtype=np.float32)
+    # Integer sample accounting: one rounding at the beat level, then all
+    # positions derive from an int cursor with no float accumulation drift.
+    beat_samples = int(round(beat_duration * fs))
+    bar_samples = beat_samples * 4
+    total_samples = sum(section["bars"] * bar_samples for section in data["sections"])
+    audio = np.zeros(total_samples, dtype=np.float32)
     kick_times = []
-
-    current_time = 0.0
-    for section in data["sections"]:
-        num_bars = section["bars"]
-        section_duration = num_bars * bar_duration
-
-        for track in section["tracks"]:
-            track_type = track["type"]
-            volume = track.get("volume", 1.0)
-
-            # Drum tracks
-            if track_type in ["kick", "hihat", "snare", "clap", "percussion"]:
-                pattern = track["pattern"]
-                pattern_len = len(pattern)
-                for bar in range(num_bars):
-                    for beat in range(4):
-                        if isinstance(pattern[beat % pattern_len], (int, float)):
-                            velocity = pattern[beat % pattern_len]
-                        else:
-                            velocity = 1 if pattern[beat % pattern_len] else 0
-
-                        if velocity > 0:
-                            drum_dur = beat_duration * 0.5
-                            hit_time = (
-                                current_time + bar * bar_duration + beat * beat_duration
-                            )
-
-                            if track_type == "kick":
-                                punch = track.get("punch", 1.0)
-                                wave = generate_kick(drum_dur, fs, punch)
-                                kick_times.append(hit_time)
-                            elif track_type == "snare":
-                                tone = track.get("tone", 0.5)
-                                wave = generate_snare(drum_dur, fs, tone)
-                            elif track_type == "clap":
-                                wave = generate_clap(drum_dur, fs)
-                            elif track_type == "percussion":
-                                wave = generate_percussion(drum_dur, fs)
-                            else:
-                                tone = track.get("tone", 0.5)
-                                wave = generate_hihat(drum_dur, fs, tone)
-
-                            wave = wave * velocity * volume
-                            start_sample = int(hit_time * fs)
-                            audio[
-                                start_sample : start_sample + len(wave)
-                            ] += wave.astype(np.float32)
-
-            # Enhanced melodic tracks
-            elif track_type in [
-                "bass",
-                "sub_bass",
-                "melody",
-                "pad",
-                "pluck",
-                "arp",
-                "supersaw",
-                "future_bass",
-                "reese_bass",
-                "pluck_bass",
-                "dubstep_bass",
-                "pitch_bend_bass",
-            ]:
-                notes = track.get("notes", [])
-                durations = track.get("durations", [])
-
-                if track_type == "pitch_bend_bass":
-                    # Handle pitch bend bass specially
-                    bend_notes = track.get("bend_notes", [])
-                    bass_style = track.get("bass_style", "pluck")
-                    seq_len = len(notes)
-                    pos = 0.0
-                    idx = 0
-
-                    while pos < section_duration:
-                        start_note = notes[idx % seq_len]
-                        end_note = (
-                            bend_notes[idx % len(bend_notes)]
-                            if bend_notes
-                            else start_note
-                        )
-                        dur_beats = durations[idx % len(durations)]
-                        note_dur = dur_beats * beat_duration
-
-                        if pos + note_dur > section_duration:
-                            note_dur = section_duration - pos
-
-                        wave = generate_pitch_bend_bass(
-                            start_note, end_note, note_dur, fs, bass_style
-                        )
-                        wave = wave * volume
-                        start_sample = int((current_time + pos) * fs)
-                        audio[start_sample : start_sample + len(wave)] += wave.astype(
-                            np.float32
-                        )
-
-                        pos += dur_beats * beat_duration
-                        idx += 1
-                else:
-                    # Regular melodic tracks
-                    seq_len = len(notes)
-                    pos = 0.0
-                    idx = 0
-
-                    while pos < section_duration:
-                        note = notes[idx % seq_len]
-                        dur_beats = durations[idx % len(durations)]
-                        note_dur = dur_beats * beat_duration
-
-                        if pos + note_dur > section_duration:
-                            note_dur = section_duration - pos
-
-                        freq = note_to_freq(note)
-
-                        # Generate appropriate waveform
-                        if track_type == "bass":
-                            wave = generate_bass(freq, note_dur, fs)
-                        elif track_type == "sub_bass":
-                            wave = generate_sub_bass(freq, note_dur, fs)
-                        elif track_type == "pad":
-                            wave = generate_pad(freq, note_dur, fs)
-                        elif track_type == "pluck":
-                            wave = generate_pluck(freq, note_dur, fs)
-                        elif track_type == "arp":
-                            wave = generate_arp(freq, note_dur, fs)
-                        elif track_type == "supersaw":
-                            detune = track.get("detune", 0.03)
-                            voices = track.get("voices", 7)
-                            wave = generate_supersaw(freq, note_dur, fs, detune, voices)
-                        elif track_type == "future_bass":
-                            wave = generate_future_bass(freq, note_dur, fs)
-                        elif track_type == "reese_bass":
-                            wave = generate_reese_bass(freq, note_dur, fs)
-                        elif track_type == "pluck_bass":
-                            wave = generate_pluck_bass(freq, note_dur, fs)
-                        elif track_type == "dubstep_bass":
-                            wobble_rate = track.get("wobble_rate", 2)
-                            wave = generate_dubstep_bass(
-                                freq, note_dur, fs, wobble_rate
-                            )
-                        else:
-                            wave = generate_melody(freq, note_dur, fs)
-
-                        # Apply automation if specified
-                        automation = track.get("automation", None)
-                        if automation:
-                            wave = apply_automation(wave, automation, note_dur, fs)
-
-                        wave = wave * volume
-                        start_sample = int((current_time + pos) * fs)
-                        audio[start_sample : start_sample + len(wave)] += wave.astype(
-                            np.float32
-                        )
-
-                        pos += dur_beats * beat_duration
-                        idx += 1
-
-            # FX tracks
-            elif track_type == "sweep":
-                sweep_dur = section_duration
-                reverse = track.get("reverse", False)
-                start_freq = track.get("start_freq", 100)
-                end_freq = track.get("end_freq", 8000)
-                wave = generate_sweep(sweep_dur, fs, start_freq, end_freq, reverse)
-                wave = wave * volume
-                start_sample = int(current_time * fs)
-                audio[start_sample : start_sample + len(wave)] += wave.astype(
-                    np.float32
-                )
-
-            elif track_type == "white_noise_riser":
-                riser_dur = section_duration
-                wave = generate_white_noise_riser(riser_dur, fs)
-                wave = wave * volume
-                start_sample = int(current_time * fs)
-                audio[start_sample : start_sample + len(wave)] += wave.astype(
-                    np.float32
-                )
-
-            elif track_type == "impact":
-                impact_dur = beat_duration * 2
-                wave = generate_impact(impact_dur, fs)
-                wave = wave * volume
-                start_sample = int(current_time * fs)
-                audio[start_sample : start_sample + len(wave)] += wave.astype(
-                    np.float32
+    # Drum hits are deterministic per (type, duration, timbre), so render each
+    # distinct one once and reuse it for every hit in the song. Melodic notes
+    # get the same treatment keyed on everything that shapes the sound.
+    drum_cache = {}
+    note_cache = {}
+
+    current_sample = 0
+    jobs = []
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for section in data["sections"]:
+            num_bars = section["bars"]
+
+            for track in section["tracks"]:
+                jobs.append(
+                    pool.submit(
+                        _render_track,
+                        track,
+                        num_bars,
+                        current_sample,
+                        beat_duration,
+                        beat_samples,
+                        fs,
+                        drum_cache,
+                        note_cache,
+                    )
                 )
 
-        current_time += section_duration
+            current_sample += num_bars * bar_samples
+
+        # The generators above are the compute-bound half; this mix pass is
+        # memory-bound, just streaming buffers through np.add. Sorting the
+        # events by position makes the pass sweep the master buffer roughly
+        # once front to back, so overlapping tracks hit each region while it
+        # is still in cache instead of hopping between sections per track.
+        events = []
+        for job in jobs:
+            track_events, kicks = job.result()
+            kick_times.extend(kicks)
+            events.extend(track_events)
+        events.sort(key=lambda event: event[0])
+        for start_sample, wave in events:
+            _mix(audio, start_sample, wave)
 
     # Apply sidechain compression
     if sidechain_enabled and kick_times:
@@ -990,17 +1501,20 @@ def generate_edm_from_yaml(yaml_file, output_wav):
             audio, kick_times, fs, tempo, sidechain_strength, sidechain_style
         )
 
-    # Final mastering
+    # Final mastering, in place to avoid full-song temporaries
     # Soft clipping for loudness
-    audio = np.tanh(audio * 0.7) * 1.2
+    audio *= 0.7
+    np.tanh(audio, out=audio)
+    audio *= 1.2
 
     # Normalize
     max_amp = np.max(np.abs(audio))
     if max_amp > 0:
-        audio = audio / max_amp * 0.95  # Leave small headroom
+        audio *= 0.95 / max_amp  # Leave small headroom
 
-    audio = (audio * 32767).astype(np.int16)
-    wavfile.write(output_wav, fs, audio)
+    if output_wav is None:
+        return fs, audio
+    _write_wav(output_wav, fs, audio)
 
 
 if __name__ == "__main__":
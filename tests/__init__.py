@@ -1 +1,8 @@
-# Test package for DJ Fluid Synth
\ No newline at end of file
+# Test package for DJ Fluid Synth
+#
+# Put the repo root on sys.path once, here, so every test module's
+# `from main import ...` resolves without repeating the insert per file.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -5,8 +5,11 @@ not just that every line is executed.
 """
 
 import unittest
+from unittest.mock import patch
+
 import numpy as np
 import tempfile
+import shutil
 import os
 import yaml
 from main import (
@@ -26,78 +29,95 @@ from main import (
 )
 
 
+# Back the temp dirs with tmpfs when the platform has it, so the YAML/WAV
+# round trips in these tests stay in memory instead of hitting a real disk.
+_TMPFS = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+def _touch_wav(path, fs, audio, chunk=1 << 20):
+    """Stand-in for main._write_wav in tests that only assert the WAV file
+    exists: creates the file but skips the int16 encode and disk write."""
+    open(path, "wb").close()
+
+
+# libyaml-backed dumper when PyYAML was built with it; the pure-Python
+# emitter is an order of magnitude slower for these little configs.
+_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _write_yaml(path, data):
+    """Serialize data in compact flow style and write it in one call."""
+    text = yaml.dump(data, Dumper=_DUMPER, default_flow_style=True)
+    with open(path, 'w') as f:
+        f.write(text)
+
+
 class TestBranchCoverage(unittest.TestCase):
     """Tests targeting specific branch conditions for 100% coverage."""
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # One shared 440 Hz test sine: the filter tests read it without
+        # mutating, so computing it per test was pure waste.
+        cls.sine440 = np.sin(2 * np.pi * 440 * np.linspace(0, 1, 44100)).astype(np.float32)
+        # Shared input for the envelope branch tests; apply_envelope
+        # returns a new array, so the ones never get mutated.
+        cls.ones1k = np.ones(1000, dtype=np.float32)
+
     def setUp(self):
         self.fs = 44100
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        # Clean up temp files
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
     
     def test_envelope_zero_attack(self):
         """Test envelope with attack=0 to cover the false branch of 'if attack_samples > 0'"""
-        wave = np.ones(1000)
-        result = apply_envelope(wave, 0.1, self.fs, attack=0.0, decay=0.01, sustain=0.5, release=0.01)
-        self.assertEqual(len(result), len(wave))
+        result = apply_envelope(self.ones1k, 0.1, self.fs, attack=0.0, decay=0.01, sustain=0.5, release=0.01)
+        self.assertEqual(len(result), len(self.ones1k))
         # First sample should start at sustain level since no attack
         self.assertGreater(result[0], 0.4)
     
-    def test_envelope_zero_decay(self):
-        """Test envelope with decay=0 to cover the false branch of 'if decay_samples > 0'"""
-        wave = np.ones(1000)
-        result = apply_envelope(wave, 0.1, self.fs, attack=0.01, decay=0.0, sustain=0.5, release=0.01)
-        self.assertEqual(len(result), len(wave))
-    
-    def test_envelope_zero_release(self):
-        """Test envelope with release=0 to cover edge cases in release calculation"""
-        wave = np.ones(1000)
-        result = apply_envelope(wave, 0.1, self.fs, attack=0.01, decay=0.01, sustain=0.5, release=0.0)
-        self.assertEqual(len(result), len(wave))
-    
-    def test_envelope_all_zero(self):
-        """Test envelope with all parameters at 0"""
-        wave = np.ones(1000)
-        result = apply_envelope(wave, 0.1, self.fs, attack=0.0, decay=0.0, sustain=0.0, release=0.0)
-        self.assertEqual(len(result), len(wave))
+    def test_envelope_zero_variants(self):
+        """Zero decay, zero release and all-zero cover the remaining false
+        branches of the envelope segment conditionals."""
+        variants = [
+            dict(attack=0.01, decay=0.0, sustain=0.5, release=0.01),
+            dict(attack=0.01, decay=0.01, sustain=0.5, release=0.0),
+            dict(attack=0.0, decay=0.0, sustain=0.0, release=0.0),
+        ]
+        for params in variants:
+            with self.subTest(params=params):
+                result = apply_envelope(self.ones1k, 0.1, self.fs, **params)
+                self.assertEqual(len(result), len(self.ones1k))
     
     def test_envelope_very_long_times(self):
         """Test envelope where attack+decay+release > duration"""
-        wave = np.ones(1000)
-        result = apply_envelope(wave, 0.02, self.fs, attack=0.5, decay=0.5, sustain=0.5, release=0.5)
-        self.assertEqual(len(result), len(wave))
+        result = apply_envelope(self.ones1k, 0.02, self.fs, attack=0.5, decay=0.5, sustain=0.5, release=0.5)
+        self.assertEqual(len(result), len(self.ones1k))
     
     def test_lowpass_with_resonance_exactly_1(self):
         """Test lowpass filter with resonance=1.0 (boundary condition)"""
-        wave = np.sin(2 * np.pi * 440 * np.linspace(0, 1, self.fs))
+        wave = self.sine440
         result = apply_lowpass(wave, 1000, self.fs, resonance=1.0)
         self.assertEqual(len(result), len(wave))
     
     def test_lowpass_with_resonance_less_than_1(self):
         """Test lowpass filter with resonance<1 to ensure no resonance branch"""
-        wave = np.sin(2 * np.pi * 440 * np.linspace(0, 1, self.fs))
+        wave = self.sine440
         result = apply_lowpass(wave, 1000, self.fs, resonance=0.5)
         self.assertEqual(len(result), len(wave))
     
     def test_lowpass_with_very_high_cutoff(self):
         """Test lowpass with cutoff > nyquist frequency"""
-        wave = np.sin(2 * np.pi * 440 * np.linspace(0, 1, self.fs))
+        wave = self.sine440
         result = apply_lowpass(wave, 25000, self.fs)  # Above nyquist
         self.assertEqual(len(result), len(wave))
     
     def test_lowpass_with_single_value_array(self):
         """Test lowpass with array cutoff of length 1"""
-        wave = np.sin(2 * np.pi * 440 * np.linspace(0, 1, self.fs))
+        wave = self.sine440
         result = apply_lowpass(wave, np.array([1000]), self.fs)
         self.assertEqual(len(result), len(wave))
     
     def test_automation_none_type(self):
         """Test automation with 'none' type or invalid type"""
-        wave = np.ones(self.fs)
+        wave = np.ones(self.fs, dtype=np.float32)
         result = apply_automation(wave, "none", 1.0, self.fs)
         np.testing.assert_array_equal(result, wave)  # Should return unchanged
     
@@ -141,52 +161,86 @@ class TestBranchCoverage(unittest.TestCase):
     
     def test_generate_supersaw_voice_variations(self):
         """Test supersaw with different voice counts"""
-        wave1 = generate_supersaw(440, 0.1, self.fs, voices=1)
-        wave3 = generate_supersaw(440, 0.1, self.fs, voices=3)
-        wave7 = generate_supersaw(440, 0.1, self.fs, voices=7)
-        
-        self.assertEqual(len(wave1), int(0.1 * self.fs))
-        self.assertEqual(len(wave3), int(0.1 * self.fs))
-        self.assertEqual(len(wave7), int(0.1 * self.fs))
+        # Half rate: the voice-count branches don't depend on fs and the
+        # supersaw is the most expensive generator in this module.
+        fs = 22050
+        for voices in (1, 3, 7):
+            with self.subTest(voices=voices):
+                wave = generate_supersaw(440, 0.1, fs, voices=voices)
+                self.assertEqual(len(wave), int(0.1 * fs))
     
     def test_generate_supersaw_detune_variations(self):
         """Test supersaw with different detune amounts"""
-        wave_none = generate_supersaw(440, 0.1, self.fs, detune=0.0)
-        wave_small = generate_supersaw(440, 0.1, self.fs, detune=0.01)
-        wave_large = generate_supersaw(440, 0.1, self.fs, detune=0.1)
-        
-        self.assertEqual(len(wave_none), int(0.1 * self.fs))
-        self.assertEqual(len(wave_small), int(0.1 * self.fs))
-        self.assertEqual(len(wave_large), int(0.1 * self.fs))
+        fs = 22050
+        for detune in (0.0, 0.01, 0.1):
+            with self.subTest(detune=detune):
+                wave = generate_supersaw(440, 0.1, fs, detune=detune)
+                self.assertEqual(len(wave), int(0.1 * fs))
     
+    def test_pitch_bend_bass_styles(self):
+        """Test pitch bend bass with all bass styles"""
+        for style in ['sub', 'reese', 'pluck', 'future']:
+            with self.subTest(style=style):
+                wave = generate_pitch_bend_bass("C2", "E2", 0.1, self.fs, bass_type=style)
+                self.assertEqual(len(wave), int(0.1 * self.fs))
+    
+    def test_generate_future_bass_frequency_zero(self):
+        """Test future bass with zero frequency"""
+        wave = generate_future_bass(0, 0.1, self.fs)
+        self.assertEqual(len(wave), int(0.1 * self.fs))
+        self.assertFalse(wave.any())
+
+
+class TestBranchCoverageYaml(unittest.TestCase):
+    """Branch coverage for the full YAML render pipeline.
+
+    These tests run whole (small) songs, so they cost far more than the
+    function-level checks above; splitting them out lets the fast layer
+    run alone during development:
+
+        python -m unittest tests.test_branch_coverage.TestBranchCoverage
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # One temp dir for the whole class, removed in a single rmtree;
+        # test filenames are unique so they cannot collide.
+        cls.temp_dir = tempfile.mkdtemp(dir=_TMPFS)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    @patch("main._write_wav", new=_touch_wav)
     def test_yaml_generation_with_all_sidechain_styles(self):
         """Test different sidechain styles to cover all branches"""
+        yaml_data = {
+            'tempo': 120,
+            'sample_rate': 44100,
+            'sidechain_strength': 0.7,
+            'sections': [{
+                'name': 'test',
+                'bars': 1,
+                'tracks': [
+                    {'type': 'kick', 'pattern': [1, 0, 0, 0]},
+                    {'type': 'pad', 'notes': ['C4'], 'durations': [4]}
+                ]
+            }]
+        }
         for style in ['pump', 'duck', 'subtle', None]:
-            yaml_data = {
-                'tempo': 120,
-                'sample_rate': 44100,
-                'sidechain': True if style else False,
-                'sidechain_style': style,
-                'sidechain_strength': 0.7,
-                'sections': [{
-                    'name': 'test',
-                    'bars': 1,
-                    'tracks': [
-                        {'type': 'kick', 'pattern': [1, 0, 0, 0]},
-                        {'type': 'pad', 'notes': ['C4'], 'durations': [4]}
-                    ]
-                }]
-            }
-            
-            yaml_path = os.path.join(self.temp_dir, f'sidechain_{style}.yml')
-            wav_path = os.path.join(self.temp_dir, f'sidechain_{style}.wav')
-            
-            with open(yaml_path, 'w') as f:
-                yaml.dump(yaml_data, f)
-            
-            generate_edm_from_yaml(yaml_path, wav_path)
-            self.assertTrue(os.path.exists(wav_path))
-    
+            with self.subTest(style=style):
+                yaml_data['sidechain'] = True if style else False
+                yaml_data['sidechain_style'] = style
+
+                yaml_path = os.path.join(self.temp_dir, f'sidechain_{style}.yml')
+                wav_path = os.path.join(self.temp_dir, f'sidechain_{style}.wav')
+
+                _write_yaml(yaml_path, yaml_data)
+
+                generate_edm_from_yaml(yaml_path, wav_path)
+                self.assertTrue(os.path.exists(wav_path))
+
+    @patch("main._write_wav", new=_touch_wav)
     def test_yaml_generation_missing_optional_fields(self):
         """Test YAML generation with missing optional fields"""
         yaml_data = {
@@ -205,12 +259,12 @@ class TestBranchCoverage(unittest.TestCase):
         yaml_path = os.path.join(self.temp_dir, 'minimal.yml')
         wav_path = os.path.join(self.temp_dir, 'minimal.wav')
         
-        with open(yaml_path, 'w') as f:
-            yaml.dump(yaml_data, f)
+        _write_yaml(yaml_path, yaml_data)
         
         generate_edm_from_yaml(yaml_path, wav_path)
         self.assertTrue(os.path.exists(wav_path))
-    
+
+    @patch("main._write_wav", new=_touch_wav)
     def test_yaml_track_with_automation(self):
         """Test tracks with automation parameter"""
         yaml_data = {
@@ -239,12 +293,12 @@ class TestBranchCoverage(unittest.TestCase):
         yaml_path = os.path.join(self.temp_dir, 'automation.yml')
         wav_path = os.path.join(self.temp_dir, 'automation.wav')
         
-        with open(yaml_path, 'w') as f:
-            yaml.dump(yaml_data, f)
+        _write_yaml(yaml_path, yaml_data)
         
         generate_edm_from_yaml(yaml_path, wav_path)
         self.assertTrue(os.path.exists(wav_path))
-    
+
+    @patch("main._write_wav", new=_touch_wav)
     def test_yaml_track_with_start_bar(self):
         """Test tracks with start_bar parameter"""
         yaml_data = {
@@ -266,24 +320,12 @@ class TestBranchCoverage(unittest.TestCase):
         yaml_path = os.path.join(self.temp_dir, 'start_bar.yml')
         wav_path = os.path.join(self.temp_dir, 'start_bar.wav')
         
-        with open(yaml_path, 'w') as f:
-            yaml.dump(yaml_data, f)
+        _write_yaml(yaml_path, yaml_data)
         
         generate_edm_from_yaml(yaml_path, wav_path)
         self.assertTrue(os.path.exists(wav_path))
-    
-    def test_pitch_bend_bass_styles(self):
-        """Test pitch bend bass with all bass styles"""
-        for style in ['sub', 'reese', 'pluck', 'future']:
-            wave = generate_pitch_bend_bass("C2", "E2", 0.1, self.fs, bass_type=style)
-            self.assertEqual(len(wave), int(0.1 * self.fs))
-    
-    def test_generate_future_bass_frequency_zero(self):
-        """Test future bass with zero frequency"""
-        wave = generate_future_bass(0, 0.1, self.fs)
-        self.assertEqual(len(wave), int(0.1 * self.fs))
-        np.testing.assert_array_equal(wave, np.zeros(len(wave)))
-    
+
+    @patch("main._write_wav", new=_touch_wav)
     def test_yaml_with_all_track_types(self):
         """Test YAML generation with every track type to ensure all branches are covered"""
         track_configs = [
@@ -324,8 +366,7 @@ class TestBranchCoverage(unittest.TestCase):
         yaml_path = os.path.join(self.temp_dir, 'all_tracks.yml')
         wav_path = os.path.join(self.temp_dir, 'all_tracks.wav')
         
-        with open(yaml_path, 'w') as f:
-            yaml.dump(yaml_data, f)
+        _write_yaml(yaml_path, yaml_data)
         
         generate_edm_from_yaml(yaml_path, wav_path)
         self.assertTrue(os.path.exists(wav_path))
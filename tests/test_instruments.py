@@ -26,9 +26,21 @@ from main import (
 )
 
 
+def setUpModule():
+    """Warm the numba-jitted kernels on tiny inputs once, so first-call
+    compile time lands here instead of inside whichever test runs first."""
+    fs = 44100
+    generate_kick(0.01, fs)
+    generate_pluck(440, 0.01, fs)
+    generate_dubstep_bass(55, 0.01, fs)
+    generate_pitch_bend_bass("A2", "E3", 0.01, fs)
+
+
 class TestInstrumentGenerators(unittest.TestCase):
     def setUp(self):
-        self.fs = 44100
+        # These tests only assert length and amplitude bounds, so half the
+        # sample rate gives the same coverage for half the synthesis work.
+        self.fs = 22050
         self.duration = 0.5
         
     def test_generate_kick(self):
@@ -38,71 +50,31 @@ class TestInstrumentGenerators(unittest.TestCase):
         # Kick should have energy
         self.assertGreater(np.sum(np.abs(wave)), 0)
         
-    def test_generate_hihat(self):
-        wave = generate_hihat(self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_snare(self):
-        wave = generate_snare(self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_clap(self):
-        wave = generate_clap(self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_percussion(self):
-        wave = generate_percussion(self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_bass(self):
-        freq = 110  # A2
-        wave = generate_bass(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
+    def test_generator_output_shapes(self):
+        """Each generator returns fs*duration samples bounded to [-1, 1]."""
+        cases = [
+            ("hihat", generate_hihat, (self.duration, self.fs)),
+            ("snare", generate_snare, (self.duration, self.fs)),
+            ("clap", generate_clap, (self.duration, self.fs)),
+            ("percussion", generate_percussion, (self.duration, self.fs)),
+            ("sweep", generate_sweep, (self.duration, self.fs)),
+            ("bass", generate_bass, (110, self.duration, self.fs)),  # A2
+            ("sub_bass", generate_sub_bass, (55, self.duration, self.fs)),  # A1
+            ("melody", generate_melody, (440, self.duration, self.fs)),  # A4
+            ("pad", generate_pad, (261.63, self.duration, self.fs)),  # C4
+            ("pluck", generate_pluck, (440, self.duration, self.fs)),  # A4
+            ("arp", generate_arp, (261.63, self.duration, self.fs)),  # C4
+        ]
+        for name, fn, args in cases:
+            with self.subTest(instrument=name):
+                wave = fn(*args)
+                self.assertEqual(len(wave), int(self.fs * self.duration))
+                self.assertLessEqual(np.max(np.abs(wave)), 1.0)
+
     def test_generate_bass_rest(self):
         wave = generate_bass(0, self.duration, self.fs)
         self.assertEqual(len(wave), int(self.fs * self.duration))
-        np.testing.assert_array_equal(wave, np.zeros(len(wave)))
-        
-    def test_generate_sub_bass(self):
-        freq = 55  # A1
-        wave = generate_sub_bass(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_melody(self):
-        freq = 440  # A4
-        wave = generate_melody(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_pad(self):
-        freq = 261.63  # C4
-        wave = generate_pad(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_pluck(self):
-        freq = 440  # A4
-        wave = generate_pluck(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_arp(self):
-        freq = 261.63  # C4
-        wave = generate_arp(freq, self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
-        
-    def test_generate_sweep(self):
-        wave = generate_sweep(self.duration, self.fs)
-        self.assertEqual(len(wave), int(self.fs * self.duration))
-        self.assertLessEqual(np.max(np.abs(wave)), 1.0)
+        self.assertFalse(wave.any())
         
     def test_generate_sweep_reverse(self):
         wave = generate_sweep(self.duration, self.fs, reverse=True)
@@ -112,7 +84,8 @@ class TestInstrumentGenerators(unittest.TestCase):
 
 class TestNewSynths(unittest.TestCase):
     def setUp(self):
-        self.fs = 44100
+        # Shape-only assertions, same as above: 22050 Hz halves the work.
+        self.fs = 22050
         self.duration = 0.5
         self.freq = 440  # A4
         
@@ -124,7 +97,7 @@ class TestNewSynths(unittest.TestCase):
     def test_generate_supersaw_rest(self):
         wave = generate_supersaw(0, self.duration, self.fs)
         self.assertEqual(len(wave), int(self.fs * self.duration))
-        np.testing.assert_array_equal(wave, np.zeros(len(wave)))
+        self.assertFalse(wave.any())
         
     def test_generate_future_bass(self):
         wave = generate_future_bass(self.freq, self.duration, self.fs)
@@ -164,7 +137,7 @@ class TestNewSynths(unittest.TestCase):
     def test_generate_pitch_bend_bass_rest(self):
         wave = generate_pitch_bend_bass("rest", "rest", self.duration, self.fs)
         self.assertEqual(len(wave), int(self.fs * self.duration))
-        np.testing.assert_array_equal(wave, np.zeros(len(wave)))
+        self.assertFalse(wave.any())
 
 
 if __name__ == '__main__':
@@ -1,15 +1,19 @@
 """Test suite for YAML validation functionality"""
 
 import unittest
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import validate_yaml_config
 
 
 class TestYAMLValidation(unittest.TestCase):
     """Test YAML configuration validation"""
+
+    def _track_config(self, track, bars=2):
+        """Minimal valid config wrapping the single track under test."""
+        return {
+            "tempo": 128,
+            "sections": [{"name": "test", "bars": bars, "tracks": [track]}],
+        }
     
     def test_valid_config(self):
         """Test that valid configuration passes"""
@@ -77,67 +81,34 @@ class TestYAMLValidation(unittest.TestCase):
     
     def test_duration_exceeds_section(self):
         """Test detection of durations exceeding section length"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,  # 8 beats total
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["C4", "D4"],
-                            "durations": [8, 8],  # 16 beats total
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["C4", "D4"],
+            "durations": [8, 8],  # 16 beats in a 2-bar (8-beat) section
+            "volume": 0.5
+        })
         errors, warnings = validate_yaml_config(config)
         self.assertTrue(any("exceeds section length" in error for error in errors))
     
     def test_notes_durations_mismatch(self):
         """Test detection of notes/durations array length mismatch"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 4,
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["C4", "D4", "E4"],
-                            "durations": [4, 4],  # Only 2 durations for 3 notes
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["C4", "D4", "E4"],
+            "durations": [4, 4],  # Only 2 durations for 3 notes
+            "volume": 0.5
+        }, bars=4)
         errors, warnings = validate_yaml_config(config)
         self.assertTrue(any("arrays don't match" in error for error in errors))
     
     def test_invalid_note_names(self):
         """Test detection of invalid note names"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["C4", "InvalidNote", "Z9"],
-                            "durations": [2, 2, 2],
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["C4", "InvalidNote", "Z9"],
+            "durations": [2, 2, 2],
+            "volume": 0.5
+        })
         errors, warnings = validate_yaml_config(config)
         # Should have 2 errors for invalid notes
         invalid_note_errors = [e for e in errors if "invalid note" in e]
@@ -145,45 +116,23 @@ class TestYAMLValidation(unittest.TestCase):
     
     def test_valid_rest_notes(self):
         """Test that 'rest' and empty string are valid notes"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["C4", "rest", "", "D4"],
-                            "durations": [2, 2, 2, 2],
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["C4", "rest", "", "D4"],
+            "durations": [2, 2, 2, 2],
+            "volume": 0.5
+        })
         errors, warnings = validate_yaml_config(config)
         # Should not have errors for rest notes
         self.assertFalse(any("invalid note" in error for error in errors))
     
     def test_invalid_pattern_velocity(self):
         """Test detection of invalid pattern velocity values"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,
-                    "tracks": [
-                        {
-                            "type": "kick",
-                            "pattern": [1, 0, 2, -0.5],  # 2 and -0.5 are invalid
-                            "volume": 0.8
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "kick",
+            "pattern": [1, 0, 2, -0.5],  # 2 and -0.5 are invalid
+            "volume": 0.8
+        })
         errors, warnings = validate_yaml_config(config)
         velocity_errors = [e for e in errors if "velocity value" in e]
         self.assertEqual(len(velocity_errors), 2)
@@ -217,24 +166,13 @@ class TestYAMLValidation(unittest.TestCase):
     
     def test_pitch_bend_mismatch(self):
         """Test detection of pitch bend notes mismatch"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,
-                    "tracks": [
-                        {
-                            "type": "pitch_bend_bass",
-                            "notes": ["A1", "B1", "C2"],
-                            "bend_notes": ["A#1"],  # Only 1 bend note for 3 notes
-                            "durations": [2, 2, 2],
-                            "volume": 0.7
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "pitch_bend_bass",
+            "notes": ["A1", "B1", "C2"],
+            "bend_notes": ["A#1"],  # Only 1 bend note for 3 notes
+            "durations": [2, 2, 2],
+            "volume": 0.7
+        })
         errors, warnings = validate_yaml_config(config)
         self.assertTrue(any("bend_notes" in error and "must match" in error for error in errors))
     
@@ -260,44 +198,22 @@ class TestYAMLValidation(unittest.TestCase):
     
     def test_short_duration_warning(self):
         """Test warning for very short durations"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 8,  # 32 beats
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["C4", "D4"],
-                            "durations": [4, 4],  # Only 8 beats (25% of section)
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["C4", "D4"],
+            "durations": [4, 4],  # Only 8 of 32 beats (25% of section)
+            "volume": 0.5
+        }, bars=8)
         errors, warnings = validate_yaml_config(config)
         self.assertTrue(any("much shorter than section" in warning for warning in warnings))
     
     def test_pattern_division_warning(self):
         """Test warning for patterns that don't divide evenly"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 4,  # 16 beats
-                    "tracks": [
-                        {
-                            "type": "kick",
-                            "pattern": [1, 0, 1, 0, 1],  # 5 elements doesn't divide 16 evenly
-                            "volume": 0.8
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "kick",
+            "pattern": [1, 0, 1, 0, 1],  # 5 elements doesn't divide 16 evenly
+            "volume": 0.8
+        }, bars=4)
         errors, warnings = validate_yaml_config(config)
         self.assertTrue(any("doesn't divide evenly" in warning for warning in warnings))
     
@@ -340,23 +256,12 @@ class TestYAMLValidation(unittest.TestCase):
     
     def test_flat_notes(self):
         """Test that flat notes (Bb, Ab, etc.) are valid"""
-        config = {
-            "tempo": 128,
-            "sections": [
-                {
-                    "name": "test",
-                    "bars": 2,
-                    "tracks": [
-                        {
-                            "type": "melody",
-                            "notes": ["Bb3", "Ab4", "Eb5", "Db2"],
-                            "durations": [2, 2, 2, 2],
-                            "volume": 0.5
-                        }
-                    ]
-                }
-            ]
-        }
+        config = self._track_config({
+            "type": "melody",
+            "notes": ["Bb3", "Ab4", "Eb5", "Db2"],
+            "durations": [2, 2, 2, 2],
+            "volume": 0.5
+        })
         errors, warnings = validate_yaml_config(config)
         # Should not have errors for flat notes
         self.assertFalse(any("invalid note" in error for error in errors))